@@ -1,11 +1,10 @@
 
-import sys, os, html, re, webbrowser
+import sys, os, html, re, heapq, bisect, webbrowser
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from collections import deque
+from typing import List, Dict, Optional, Tuple
 
 # ---------------- Process ----------------
-@dataclass
+@dataclass(slots=True)
 class Process:
     name: str
     arrival: int
@@ -17,163 +16,275 @@ class Process:
     def __post_init__(self):
         self.remaining = self.burst
 
-# ---------------- Helpers ----------------
-def arrivals_index(processes: List[Process]) -> Dict[int, List[Process]]:
-    idx: Dict[int, List[Process]] = {}
-    for p in processes:
-        idx.setdefault(p.arrival, []).append(p)
-    for t in idx:
-        idx[t].sort(key=lambda x: x.name)
-    return idx
+# ---------------- Events ----------------
+# schedulers record (time, kind, name, n) tuples; n is the burst left for
+# SELECTED and the end of the span for IDLE. Strings are built only once
+# the run is over, in format_timeline.
+ARRIVED, SELECTED, FINISHED, IDLE = range(4)
+Event = Tuple[int, int, Optional[str], int]
+
+def format_timeline(events: List[Event]) -> List[str]:
+    # several lines often share a tick (arrivals, a finish and the next
+    # selection), so each "Time ttt : " prefix is formatted once, on first use
+    prefix: Dict[int, str] = {}
+    # bursts are small ints that repeat a lot; format each " selected (burst nnn)" tail once
+    selected: Dict[int, str] = {}
+    lines: List[str] = []
+    for t, kind, name, n in events:
+        if kind == IDLE:
+            lines.extend([f"Time {i:3d} : Idle" for i in range(t, n)])
+            continue
+        head = prefix.get(t)
+        if head is None:
+            head = prefix[t] = f"Time {t:3d} : "
+        if kind == ARRIVED:
+            lines.append(head + name + " arrived")
+        elif kind == SELECTED:
+            tail = selected.get(n)
+            if tail is None:
+                tail = selected[n] = f" selected (burst {n:3d})"
+            lines.append(head + name + tail)
+        else:
+            lines.append(head + name + " finished")
+    return lines
 
-def calc_metrics(ps: List[Process]):
+# ---------------- Helpers ----------------
+def calc_metrics(ps: List[Process]) -> Dict[str, Tuple[Optional[int], Optional[int], Optional[int]]]:
+    # name -> (waiting, turnaround, response)
     out = {}
     for p in ps:
         if p.finish_time is None or p.start_time is None:
-            out[p.name] = {"waiting": None, "turnaround": None, "response": None}
+            out[p.name] = (None, None, None)
         else:
             tat = p.finish_time - p.arrival
-            wait = tat - p.burst
-            resp = p.start_time - p.arrival
-            out[p.name] = {"waiting": wait, "turnaround": tat, "response": resp}
+            out[p.name] = (tat - p.burst, tat, p.start_time - p.arrival)
     return out
 
 def fmt3(x):
     return f"{x:3d}" if isinstance(x, int) else "  -"
 
+def arrival_times(processes: List[Process], runfor: int) -> Tuple[List[int], int]:
+    # arrival times of the (arrival-sorted) processes, plus the index of the
+    # first one arriving at or after time 0. The clock starts at 0, so the
+    # ones before that are never announced; schedulers start their arrival
+    # pointer there. The trailing sentinel lies past every time the loops ask
+    # about (at least 0, even when runfor is negative), so the next arrival
+    # can be peeked at without a bounds check.
+    arr = [p.arrival for p in processes]
+    first = bisect.bisect_left(arr, 0)
+    arr.append(max(runfor, 0) + 1)
+    return arr, first
+
 # ---------------- FCFS ----------------
-def fcfs(processes: List[Process], runfor: int, timeline: List[str]):
+def fcfs(processes: List[Process], runfor: int, events: List[Event]):
     t = 0
-    by_time = arrivals_index(processes)
+    arr, nxt = arrival_times(processes, runfor)
 
     def emit_arrivals(now: int):
-        for p in by_time.pop(now, []):
-            timeline.append(f"Time {now:3d} : {p.name} arrived")
+        nonlocal nxt
+        while arr[nxt] <= now:
+            p = processes[nxt]
+            events.append((p.arrival, ARRIVED, p.name, 0))
+            nxt += 1
 
-    ready_order = sorted(processes, key=lambda p: (p.arrival, p.name))
-
-    for p in ready_order:
-        while t < p.arrival and t < runfor:
-            emit_arrivals(t)
-            timeline.append(f"Time {t:3d} : Idle")
-            t += 1
+    for p in processes:
+        if t < p.arrival:
+            end = min(p.arrival, runfor)
+            events.append((t, IDLE, None, end))
+            t = end
         if t >= runfor:
             break
 
-        emit_arrivals(t)
+        if arr[nxt] <= t:
+            emit_arrivals(t)
 
-        if p.start_time is None:
-            p.start_time = t
-            timeline.append(f"Time {t:3d} : {p.name} selected (burst {p.remaining:3d})")
+        p.start_time = t
+        events.append((t, SELECTED, p.name, p.remaining))
 
-        while p.remaining > 0 and t < runfor:
-            t += 1
-            p.remaining -= 1
+        # FCFS never preempts: run straight to completion or the end of the
+        # run; a negative burst is selected but never runs
+        ran = max(0, min(p.remaining, runfor - t))
+        p.remaining -= ran
+        t += ran
+        if arr[nxt] <= t:
             emit_arrivals(t)
 
         if p.remaining == 0:
             p.finish_time = t
-            timeline.append(f"Time {t:3d} : {p.name} finished")
+            events.append((t, FINISHED, p.name, 0))
 
-    while t < runfor:
-        emit_arrivals(t)
-        timeline.append(f"Time {t:3d} : Idle")
-        t += 1
+    # everything has arrived and run by now: the rest of the run is one idle span
+    if t < runfor:
+        events.append((t, IDLE, None, runfor))
 
 # ---------------- SJF Preemptive ----------------
-def sjf_preemptive(processes: List[Process], runfor: int, timeline: List[str]):
+def sjf_preemptive(processes: List[Process], runfor: int, events: List[Event],
+                   tau: Optional[int] = None):
     t = 0
-    by_time = arrivals_index(processes)
+    arr, nxt = arrival_times(processes, runfor)
+
+    # heap of waiting (rank, remaining, seq, proc). seq is the position in the
+    # (arrival, name)-sorted list, so it stands in for the arrival and name
+    # tie-breaks in one int compare. rank drops from 1 to 0 once a process has
+    # waited more than tau ticks, lifting it above every unaged process so
+    # long jobs cannot starve. The running process is held outside the heap
+    # in `entry`.
+    ready: List[tuple] = []
+    push, pop, pushpop = heapq.heappush, heapq.heappop, heapq.heappushpop
+    next_aging = runfor
+
+    def aged_at(p: Process) -> int:
+        return p.arrival + (p.burst - p.remaining) + tau + 1
+
+    def wait(e: tuple):
+        nonlocal next_aging
+        if tau is not None and e[0]:
+            next_aging = min(next_aging, aged_at(e[3]))
+
+    def promote(now: int):
+        nonlocal next_aging
+        next_aging = runfor
+        for i, e in enumerate(ready):
+            if e[0]:
+                if aged_at(e[3]) <= now:
+                    ready[i] = (0,) + e[1:]
+                else:
+                    next_aging = min(next_aging, aged_at(e[3]))
+        heapq.heapify(ready)
+
+    def admit(i: int):
+        p = processes[i]
+        if p.remaining > 0:
+            e = (1, p.remaining, i, p)
+            push(ready, e)
+            wait(e)
 
     def emit_arrivals(now: int):
-        for p in by_time.pop(now, []):
-            timeline.append(f"Time {now:3d} : {p.name} arrived")
+        nonlocal nxt
+        while arr[nxt] <= now:
+            p = processes[nxt]
+            events.append((p.arrival, ARRIVED, p.name, 0))
+            admit(nxt)
+            nxt += 1
 
-    current: Optional[Process] = None
+    # processes that arrived before the clock started are ready at 0, unannounced
+    for i in range(nxt):
+        admit(i)
 
-    def pick(now: int) -> Optional[Process]:
-        r = [p for p in processes if p.arrival <= now and p.remaining > 0]
-        if not r:
-            return None
-        r.sort(key=lambda p: (p.remaining, p.arrival, p.name))
-        return r[0]
+    current: Optional[Process] = None
+    entry: Optional[tuple] = None
 
+    # the choice can only change when a process arrives, finishes or ages,
+    # so jump straight from one of those events to the next
     while t < runfor:
-        emit_arrivals(t)
-        if not any(p.arrival <= t and p.remaining > 0 for p in processes):
-            timeline.append(f"Time {t:3d} : Idle")
-            t += 1
-            continue
+        if arr[nxt] <= t:
+            emit_arrivals(t)
+        if t >= next_aging:
+            promote(t)
+        if current is None:
+            if not ready:
+                end = min(arr[nxt], runfor)
+                events.append((t, IDLE, None, end))
+                t = end
+                continue
+            entry = pop(ready)
+        else:
+            # hands the running process straight back unless a newcomer beats it
+            running = entry
+            entry = pushpop(ready, running)
+            if entry is not running:
+                wait(running)
 
-        best = pick(t)
+        best = entry[3]
         if current is not best:
             current = best
             if current.start_time is None:
                 current.start_time = t
-            timeline.append(f"Time {t:3d} : {current.name} selected (burst {current.remaining:3d})")
+            events.append((t, SELECTED, current.name, current.remaining))
 
-        current.remaining -= 1
-        t += 1
-        emit_arrivals(t)
+        delta = min(current.remaining, arr[nxt] - t, next_aging - t, runfor - t)
+        current.remaining -= delta
+        t += delta
+        if arr[nxt] <= t:
+            emit_arrivals(t)
         if current.remaining == 0:
             current.finish_time = t
-            timeline.append(f"Time {t:3d} : {current.name} finished")
+            events.append((t, FINISHED, current.name, 0))
             current = None
+        else:
+            entry = (entry[0], current.remaining, entry[2], current)
 
 # ---------------- Round Robin ----------------
-def rr(processes: List[Process], runfor: int, quantum: int, timeline: List[str]):
+def rr(processes: List[Process], runfor: int, quantum: int, events: List[Event]):
     if quantum <= 0:
         print("Error: Missing quantum parameter when use is 'rr'")
         sys.exit(1)
 
     t = 0
-    by_time = arrivals_index(processes)
-    rq = deque()
+    arr, nxt = arrival_times(processes, runfor)
+
+    # ready queue as a fixed ring of n slots: a process is never queued
+    # twice at once, so it cannot overflow and never reallocates
+    n = len(processes)
+    rq: List[Optional[Process]] = [None] * n
+    head = size = 0
 
     def emit_and_enqueue(now: int):
-        for p in by_time.pop(now, []):
-            timeline.append(f"Time {now:3d} : {p.name} arrived")
-            rq.append(p)
+        nonlocal nxt, size
+        while arr[nxt] <= now:
+            p = processes[nxt]
+            events.append((p.arrival, ARRIVED, p.name, 0))
+            rq[(head + size) % n] = p
+            size += 1
+            nxt += 1
 
     emit_and_enqueue(0)
 
+    # every path through the loop has already flushed arrivals up to t
     while t < runfor:
-        emit_and_enqueue(t)
-        if not rq:
-            timeline.append(f"Time {t:3d} : Idle")
-            t += 1
+        if not size:
+            end = min(arr[nxt], runfor)
+            events.append((t, IDLE, None, end))
+            t = end
             emit_and_enqueue(t)
             continue
 
-        p = rq.popleft()
+        p = rq[head]
+        head = (head + 1) % n
+        size -= 1
         if p.start_time is None:
             p.start_time = t
-        timeline.append(f"Time {t:3d} : {p.name} selected (burst {p.remaining:3d})")
-
-        ticks = min(quantum, p.remaining, runfor - t)
-        for _ in range(ticks):
-            p.remaining -= 1
-            t += 1
+        events.append((t, SELECTED, p.name, p.remaining))
+
+        # arrivals during the slice only queue up behind it, so the whole
+        # slice can be applied in one step and the arrivals flushed after
+        ticks = max(0, min(quantum, p.remaining, runfor - t))
+        p.remaining -= ticks
+        t += ticks
+        if arr[nxt] <= t:
             emit_and_enqueue(t)
-            if p.remaining == 0:
-                p.finish_time = t
-                timeline.append(f"Time {t:3d} : {p.name} finished")
-                break
+        if ticks and p.remaining == 0:
+            p.finish_time = t
+            events.append((t, FINISHED, p.name, 0))
 
         if p.remaining > 0:
-            rq.append(p)
+            rq[(head + size) % n] = p
+            size += 1
 
 # ---------------- HTML Renderer ----------------
+_BURST_RE = re.compile(r"\(burst\s+(\d+)\)")
+
 def render_html(htmlfile: str, title: str, runfor: int, quantum: Optional[int],
-                timeline: List[str], processes: List[Process], metrics: Dict[str, Dict[str, Optional[int]]]) -> None:
+                timeline: List[str], processes: List[Process],
+                metrics: Dict[str, Tuple[Optional[int], Optional[int], Optional[int]]]) -> None:
     def td(x):
         return html.escape(str(x)) if x is not None else "&nbsp;"
 
-    # process metrics
+    # process metrics; main passes processes already sorted by name
     rows = []
-    for p in sorted(processes, key=lambda x: x.name):
+    for p in processes:
         status = "Finished" if p.finish_time is not None else "Did not finish"
-        m = metrics[p.name]
+        waiting, turnaround, response = metrics[p.name]
         rows.append(f"""
         <tr>
           <td>{html.escape(p.name)}</td>
@@ -181,9 +292,9 @@ def render_html(htmlfile: str, title: str, runfor: int, quantum: Optional[int],
           <td>{p.burst}</td>
           <td>{"" if p.start_time is None else p.start_time}</td>
           <td>{"" if p.finish_time is None else p.finish_time}</td>
-          <td>{"" if m["turnaround"] is None else m["turnaround"]}</td>
-          <td>{"" if m["waiting"]    is None else m["waiting"]}</td>
-          <td>{"" if m["response"]   is None else m["response"]}</td>
+          <td>{"" if turnaround is None else turnaround}</td>
+          <td>{"" if waiting    is None else waiting}</td>
+          <td>{"" if response   is None else response}</td>
           <td>{status}</td>
         </tr>""")
 
@@ -194,9 +305,13 @@ def render_html(htmlfile: str, title: str, runfor: int, quantum: Optional[int],
             parts = line.split(":", 1)
             time_part = parts[0].replace("Time", "").strip()
             msg = parts[1].strip()
-            # highlight bursts in red
-            msg = re.sub(r"\(burst\s+(\d+)\)", r'<span class="burst">(burst \1)</span>', msg)
-            trows.append(f"<tr><td>{html.escape(time_part)}</td><td>{msg}</td></tr>")
+            # highlight bursts in red; only "selected" lines carry one
+            if "(burst" in msg:
+                msg = _BURST_RE.sub(r'<span class="burst">(burst \1)</span>', msg)
+            # the time column is plain digits from format_timeline; nothing to escape
+            if not time_part.isdigit():
+                time_part = html.escape(time_part)
+            trows.append(f"<tr><td>{time_part}</td><td>{msg}</td></tr>")
         except Exception:
             trows.append(f"<tr><td></td><td>{html.escape(line)}</td></tr>")
 
@@ -211,40 +326,31 @@ def render_html(htmlfile: str, title: str, runfor: int, quantum: Optional[int],
     .burst { color: red; font-weight: 600; }
     """
 
-    html_doc = f"""<!doctype html>
-<html lang="en">
-<meta charset="utf-8">
-<title>{html.escape(title)}</title>
-<style>{css}</style>
-<body>
-  <h1>{html.escape(title)}</h1>
-  <div class="meta">Process count: <b>{len(processes)}</b>{"<br>Quantum: <b>"+str(quantum)+"</b>" if quantum else ""}</div>
-
-  <table>
-    <thead><tr><th>Time</th><th>Event</th></tr></thead>
-    <tbody>
-      {''.join(trows)}
-    </tbody>
-  </table>
-  <div class="meta">Finished at time <b>{runfor}</b></div>
-
-  <table>
-    <thead>
-      <tr>
-        <th>Process</th><th>Arrival</th><th>Burst</th>
-        <th>Start</th><th>Finish</th>
-        <th>Turnaround</th><th>Waiting</th><th>Response</th><th>Status</th>
-      </tr>
-    </thead>
-    <tbody>
-      {''.join(rows)}
-    </tbody>
-  </table>
-</body>
-</html>"""
-
-    with open(htmlfile, "w", encoding="utf-8") as f:
-        f.write(html_doc)
+    title_html = html.escape(title)
+    parts = [
+        '<!doctype html>\n<html lang="en">\n<meta charset="utf-8">\n<title>', title_html,
+        "</title>\n<style>", css, "</style>\n<body>\n  <h1>", title_html,
+        '</h1>\n  <div class="meta">Process count: <b>', str(len(processes)), "</b>",
+        "<br>Quantum: <b>" + str(quantum) + "</b>" if quantum else "",
+        "</div>\n\n  <table>\n    <thead><tr><th>Time</th><th>Event</th></tr></thead>\n"
+        "    <tbody>\n      ",
+    ]
+    parts.extend(trows)
+    parts.extend([
+        "\n    </tbody>\n  </table>\n"
+        '  <div class="meta">Finished at time <b>', str(runfor), "</b></div>\n\n"
+        "  <table>\n    <thead>\n      <tr>\n"
+        "        <th>Process</th><th>Arrival</th><th>Burst</th>\n"
+        "        <th>Start</th><th>Finish</th>\n"
+        "        <th>Turnaround</th><th>Waiting</th><th>Response</th><th>Status</th>\n"
+        "      </tr>\n    </thead>\n    <tbody>\n      ",
+    ])
+    parts.extend(rows)
+    parts.append("\n    </tbody>\n  </table>\n</body>\n</html>")
+
+    # write the pieces straight out instead of joining them into one big string first
+    with open(htmlfile, "wb") as f:
+        f.writelines(part.encode("utf-8") for part in parts)
 
 # ---------------- Main ----------------
 def main():
@@ -270,41 +376,45 @@ def main():
     runfor = None
     algo = None
     quantum = None
+    aging = None
+    aging_default = False
     saw_end = False
     processes: List[Process] = []
 
     for line in raw_lines:
-        if line.startswith("processcount"):
+        # split once and dispatch on the directive word
+        parts = line.split()
+        key = parts[0]
+        if key == "processcount":
             try:
-                processcount = int(line.split()[1])
+                processcount = int(parts[1])
             except (IndexError, ValueError):
                 print("Error: Missing parameter processcount")
                 sys.exit(1)
 
-        elif line.startswith("runfor"):
+        elif key == "runfor":
             try:
-                runfor = int(line.split()[1])
+                runfor = int(parts[1])
             except (IndexError, ValueError):
                 print("Error: Missing parameter runfor")
                 sys.exit(1)
 
-        elif line.startswith("use"):
+        elif key == "use":
             try:
-                algo = line.split()[1]
+                algo = parts[1]
             except IndexError:
                 print("Error: Missing parameter use")
                 sys.exit(1)
 
-        elif line.startswith("quantum"):
+        elif key == "quantum":
             try:
-                quantum = int(line.split()[1])
+                quantum = int(parts[1])
             except (IndexError, ValueError):
                 print("Error: Missing quantum parameter when use is 'rr'")
                 sys.exit(1)
 
-        elif line.startswith("process"):
+        elif key == "process":
             try:
-                parts = line.split()
                 name = parts[2]
                 arrival = int(parts[4])
                 burst = int(parts[6])
@@ -312,6 +422,23 @@ def main():
                 print("Error: Malformed process directive. Expected: process name <id> arrival <n> burst <n>")
                 sys.exit(1)
             processes.append(Process(name, arrival, burst))
+
+        elif key == "aging":
+            # optional, sjf only: "aging <n>" promotes jobs that have waited
+            # more than n ticks; a bare "aging" uses three times the mean burst
+            if len(parts) > 1:
+                try:
+                    aging = int(parts[1])
+                    if aging < 0:
+                        raise ValueError
+                except ValueError:
+                    print("Error: Malformed aging directive. Expected: aging [<n>]")
+                    sys.exit(1)
+                aging_default = False
+            else:
+                aging = None
+                aging_default = True
+
         elif line == "end":
             saw_end = True
             break
@@ -334,52 +461,70 @@ def main():
     if algo == "rr" and quantum is None:
         print("Error: Missing quantum parameter when use is 'rr'")
         sys.exit(1)
+    if (aging is not None or aging_default) and algo != "sjf":
+        print("Error: aging directive is only valid when use is 'sjf'")
+        sys.exit(1)
     if processcount != len(processes):
         print(f"Error: processcount ({processcount}) does not match number of process lines ({len(processes)})")
         sys.exit(1)
 
-    timeline: List[str] = []
+    if aging_default:
+        # negative bursts could drag the mean below 0; never age on admission
+        aging = max(0, 3 * sum(p.burst for p in processes) // max(len(processes), 1))
+
+    # the schedulers walk processes in arrival order with a single pointer
+    processes.sort(key=lambda p: (p.arrival, p.name))
+
+    events: List[Event] = []
     header_title = ""
     if algo == "fcfs":
         header_title = "Using First-Come First-Served"
-        fcfs(processes, runfor, timeline)
+        fcfs(processes, runfor, events)
     elif algo == "sjf":
         header_title = "Using preemptive Shortest Job First"
-        sjf_preemptive(processes, runfor, timeline)
+        sjf_preemptive(processes, runfor, events, aging)
     elif algo == "rr":
         header_title = "Using Round-Robin"
-        rr(processes, runfor, quantum, timeline)
+        rr(processes, runfor, quantum, events)
     else:
         print(f"Error: Unknown scheduling algorithm '{algo}'")
         sys.exit(1)
+    timeline = format_timeline(events)
 
     out_lines: List[str] = []
     out_lines.append(f"{processcount} processes")
     out_lines.append(header_title)
     if algo == "rr":
         out_lines.append(f"Quantum {quantum}\n")
-    for line in timeline:
-        out_lines.append(line)
+    out_lines.extend(timeline)
     out_lines.append(f"Finished at time {runfor:3d}")
     out_lines.append("")
 
     metrics = calc_metrics(processes)
-    for p in sorted(processes, key=lambda x: x.name):
+    by_name = sorted(processes, key=lambda x: x.name)
+    for p in by_name:
         if p.finish_time is not None:
-            m = metrics[p.name]
-            out_lines.append(f"{p.name} wait {fmt3(m['waiting'])} "
-                             f"turnaround {fmt3(m['turnaround'])} "
-                             f"response {fmt3(m['response'])}")
-    for p in sorted(processes, key=lambda x: x.name):
+            waiting, turnaround, response = metrics[p.name]
+            out_lines.append(f"{p.name} wait {fmt3(waiting)} "
+                             f"turnaround {fmt3(turnaround)} "
+                             f"response {fmt3(response)}")
+    for p in by_name:
         if p.finish_time is None:
             out_lines.append(f"{p.name} did not finish")
 
-    with open(out_txt, "w") as f:
-        f.write("\n".join(out_lines) + "\n")
+    # encode line by line into one buffer, so there is no extra joined copy
+    # of the report; out_lines (and timeline, kept for the html) still hold
+    # it as str meanwhile
+    buf = bytearray()
+    for line in out_lines:
+        buf += line.encode("utf-8")
+        buf += b"\n"
+    with open(out_txt, "wb") as f:
+        f.write(buf)
 
     # write html + open automatically
     render_html(out_html, header_title, runfor, quantum if algo == "rr" else None,
-                timeline, processes, metrics)
+                timeline, by_name, metrics)
     try:
         webbrowser.open("file://" + os.path.abspath(out_html))
     except Exception as e:
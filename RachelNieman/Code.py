@@ -14,23 +14,25 @@ This version:
 
 import sys
 import os
-from collections import deque
+import heapq
+from itertools import groupby
 
 # -------------------------
 # Process data structure
 # -------------------------
 class Process:
-    def __init__(self, name, arrival, burst):
-        self.name = name
+    __slots__ = ('name', 'arrival', 'burst', 'remaining', 'start_time', 'finish_time', 'run_time',
+                 'index')
+
+    def __init__(self, name, arrival, burst, index=0):
+        self.name = sys.intern(name)
         self.arrival = int(arrival)
         self.burst = int(burst)
         self.remaining = int(burst)
         self.start_time = None
         self.finish_time = None
         self.run_time = 0
-
-    def is_finished(self):
-        return self.remaining <= 0
+        self.index = index  # position in the input file
 
 # -------------------------
 # Utility: error & usage
@@ -46,6 +48,50 @@ def error_and_exit(msg):
 # -------------------------
 # Input parsing
 # -------------------------
+def _set_int(key, tokens, params, processes):
+    if len(tokens) < 2:
+        error_and_exit(f"Error: Missing parameter {key}")
+    params[key] = int(tokens[1])
+
+def _set_lower(key, tokens, params, processes):
+    if len(tokens) < 2:
+        error_and_exit(f"Error: Missing parameter {key}")
+    params[key] = tokens[1].lower()
+
+PROCESS_KEYS = frozenset(('name', 'arrival', 'burst'))
+
+def _parse_process(key, tokens, params, processes):
+    # one left-to-right walk over "name <id> arrival <n> burst <n>" in any
+    # order; other tokens are skipped
+    kv = {}
+    it = iter(tokens[1:])
+    for t in it:
+        k = t.lower()
+        if k in PROCESS_KEYS:
+            # the first occurrence wins; a trailing keyword with no value
+            # still counts as present
+            kv.setdefault(k, next(it, None))
+
+    # a missing keyword is reported ahead of a dangling one
+    try:
+        name, arrival, burst = kv['name'], kv['arrival'], kv['burst']
+    except KeyError as e:
+        error_and_exit(f"Error: Missing parameter {e.args[0]}")
+    if None in (name, arrival, burst):
+        error_and_exit("Error: Malformed process line")
+
+    processes.append(Process(name, arrival, burst, len(processes)))
+
+# directive -> handler(key, tokens, params, processes); 'end' stops parsing
+# and anything else is ignored
+HANDLERS = {
+    'processcount': _set_int,
+    'runfor': _set_int,
+    'use': _set_lower,
+    'quantum': _set_int,
+    'process': _parse_process,
+}
+
 def parse_input_file(path):
     with open(path, 'r') as f:
         raw_lines = f.readlines()
@@ -61,71 +107,14 @@ def parse_input_file(path):
     params = {'processcount': None, 'runfor': None, 'use': None, 'quantum': None}
     processes = []
 
-    i = 0
-    while i < len(lines):
-        tokens = lines[i].split()
-        if not tokens:
-            i += 1
-            continue
+    for line in lines:
+        tokens = line.split()
         key = tokens[0].lower()
-
-        if key == 'processcount':
-            if len(tokens) < 2:
-                error_and_exit("Error: Missing parameter processcount")
-            params['processcount'] = int(tokens[1])
-            i += 1
-            continue
-
-        if key == 'runfor':
-            if len(tokens) < 2:
-                error_and_exit("Error: Missing parameter runfor")
-            params['runfor'] = int(tokens[1])
-            i += 1
-            continue
-
-        if key == 'use':
-            if len(tokens) < 2:
-                error_and_exit("Error: Missing parameter use")
-            params['use'] = tokens[1].lower()
-            i += 1
-            continue
-
-        if key == 'quantum':
-            if len(tokens) < 2:
-                error_and_exit("Error: Missing parameter quantum")
-            params['quantum'] = int(tokens[1])
-            i += 1
-            continue
-
-        if key == 'process':
-            try:
-                tokens_lower = [t.lower() for t in tokens]
-                if 'name' not in tokens_lower:
-                    error_and_exit("Error: Missing parameter name")
-                if 'arrival' not in tokens_lower:
-                    error_and_exit("Error: Missing parameter arrival")
-                if 'burst' not in tokens_lower:
-                    error_and_exit("Error: Missing parameter burst")
-
-                name_idx = tokens_lower.index('name')
-                arrival_idx = tokens_lower.index('arrival')
-                burst_idx = tokens_lower.index('burst')
-
-                name = tokens[name_idx + 1]
-                arrival = tokens[arrival_idx + 1]
-                burst = tokens[burst_idx + 1]
-
-            except Exception:
-                error_and_exit("Error: Malformed process line")
-
-            processes.append(Process(name, arrival, burst))
-            i += 1
-            continue
-
         if key == 'end':
             break
-
-        i += 1
+        handler = HANDLERS.get(key)
+        if handler is not None:
+            handler(key, tokens, params, processes)
 
     if params['processcount'] is None:
         error_and_exit("Error: Missing parameter processcount")
@@ -141,141 +130,267 @@ def parse_input_file(path):
     if len(processes) > params['processcount']:
         processes = processes[:params['processcount']]
 
+    # every simulator walks arrivals in time order; sort once here. The sort
+    # is stable, so equal arrivals stay in input order.
+    processes.sort(key=lambda p: p.arrival)
+
     return params, processes
 
+# -------------------------
+# Log events
+# -------------------------
+# Each simulate_* function returns its log as a list of
+# (time, kind, name, value) entries, kind being one of the codes below.
+#   ARRIVED / FINISHED: value is unused (0)
+#   SELECTED:           value is the process's remaining burst
+#   IDLE:               name is None; the idle run covers time .. value-1
+ARRIVED, SELECTED, FINISHED, IDLE = range(4)
+
+def format_log(events):
+    # lines come out as utf-8 bytes, ready for a binary writelines; each
+    # name is encoded once
+    lines = []
+    add = lines.append
+    encoded = {}
+    for time, kind, name, value in events:
+        if name is not None:
+            name_b = encoded.get(name)
+            if name_b is None:
+                name_b = encoded[name] = name.encode('utf-8')
+        if kind == ARRIVED:
+            add(b"Time %d : %s arrived\n" % (time, name_b))
+        elif kind == SELECTED:
+            add(b"Time %d : %s selected (burst %d)\n" % (time, name_b, value))
+        elif kind == FINISHED:
+            add(b"Time %d : %s finished\n" % (time, name_b))
+        else:
+            # the output lists every idle tick, so a span is expanded here in one go
+            lines.extend([b"Time %d : Idle\n" % t for t in range(time, value)])
+    return lines
+
 # -------------------------
 # Scheduling simulators
 # -------------------------
+def arrivals_by_time(process_list):
+    # (time, [processes]) buckets of the already arrival-sorted process_list,
+    # each bucket in process_list order, closed by a sentinel bucket that
+    # never arrives
+    buckets = [(at, list(group)) for at, group in groupby(process_list, key=lambda p: p.arrival)]
+    buckets.append((float('inf'), []))
+    return buckets
+
 def simulate_fcfs(process_list, runfor):
-    ordered = sorted(process_list, key=lambda p: (p.arrival, p.name))
-    log = []
+    # FCFS never preempts, so the schedule is closed-form: taken in
+    # (arrival, name) order, each process starts at the later of its arrival
+    # and the previous finish. Walk that order once instead of simulating.
+    # process_list is already in arrival order, so only ties are sorted, by
+    # name. Arrivals before time 0 are never seen by the scheduler.
+    order = [p for at, procs in arrivals_by_time(process_list) if at >= 0
+             for p in sorted(procs, key=lambda p: p.name)]
+    events = []
+    log_append = events.append
     time = 0
-    queue = deque()
-    current_proc = None
-
-    while time < runfor:
-        for p in ordered:
-            if p.arrival == time:
-                log.append(f"Time {time} : {p.name} arrived")
-                queue.append(p)
-
-        if current_proc is None or current_proc.is_finished():
-            if current_proc is not None and current_proc.is_finished():
-                current_proc = None
-            if queue:
-                candidate = queue.popleft()
-                if not candidate.is_finished():
-                    current_proc = candidate
-                    if candidate.start_time is None:
-                        candidate.start_time = time
-                    log.append(f"Time {time} : {candidate.name} selected (burst {candidate.remaining})")
-
-        if current_proc is None:
-            log.append(f"Time {time} : Idle")
+    logged = 0
+
+    def log_arrivals(upto):
+        # log every arrival before upto (and before runfor) not yet logged
+        nonlocal logged
+        limit = min(upto, runfor)
+        while logged < len(order) and order[logged].arrival < limit:
+            p = order[logged]
+            log_append((p.arrival, ARRIVED, p.name, 0))
+            logged += 1
+
+    for p in order:
+        if p.arrival >= runfor:
+            break
+        if p.arrival > time:
+            log_append((time, IDLE, None, p.arrival))
+            time = p.arrival
+
+        # arrivals at the current time are logged ahead of whatever happens now
+        log_arrivals(time + 1)
+        if p.remaining <= 0:
+            # a zero-burst process is never selected but still costs its tick
+            log_append((time, IDLE, None, time + 1))
+            time += 1
         else:
-            current_proc.remaining -= 1
-            current_proc.run_time += 1
-            if current_proc.remaining == 0:
-                log.append(f"Time {time + 1} : {current_proc.name} finished")
-                current_proc.finish_time = time + 1
-        time += 1
+            # each process is visited exactly once, so this is its first start
+            p.start_time = time
+            log_append((time, SELECTED, p.name, p.remaining))
+            run = min(p.remaining, runfor - time)
+            p.remaining -= run
+            p.run_time += run
+            time += run
+            log_arrivals(time)
+            if p.remaining == 0:
+                log_append((time, FINISHED, p.name, 0))
+                p.finish_time = time
+        if time >= runfor:
+            break
 
-    return log
+    log_arrivals(runfor)
+    if time < runfor:
+        log_append((time, IDLE, None, runfor))
+
+    return events
 
 def simulate_sjf_preemptive(process_list, runfor):
-    log = []
+    events = []
+    log_append = events.append
     time = 0
     last_selected = None
 
+    arrivals = arrivals_by_time(process_list)
+    next_bucket = 0
+    # ready heap of (remaining, arrival, name, seq, process); seq counts
+    # admissions, which matches input order among equal arrivals
+    heap = []
+    seq = 0
+    heappush, heappop, heappushpop = heapq.heappush, heapq.heappop, heapq.heappushpop
+
+    def admit(now):
+        nonlocal next_bucket, seq
+        while arrivals[next_bucket][0] <= now:
+            at, procs = arrivals[next_bucket]
+            for p in procs:
+                if at == now:
+                    log_append((now, ARRIVED, p.name, 0))
+                if p.remaining > 0:
+                    heappush(heap, (p.remaining, p.arrival, p.name, seq, p))
+                    seq += 1
+            next_bucket += 1
+
+    # heap tuple of the running process, or None; it is kept out of heap
+    # and swapped back in at the next event by a single heappushpop
+    entry = None
+
+    # the shortest job can only change when something arrives or finishes,
+    # so run the current pick straight through to the next such event
     while time < runfor:
-        for p in process_list:
-            if p.arrival == time:
-                log.append(f"Time {time} : {p.name} arrived")
-
-        ready = [p for p in process_list if p.arrival <= time and not p.is_finished()]
-
-        if ready:
-            selected = min(ready, key=lambda x: (x.remaining, x.arrival, x.name))
-            if last_selected is None or last_selected.name != selected.name:
-                if selected.start_time is None:
-                    selected.start_time = time
-                log.append(f"Time {time} : {selected.name} selected (burst {selected.remaining})")
-            selected.remaining -= 1
-            selected.run_time += 1
-            if selected.remaining == 0:
-                selected.finish_time = time + 1
-                log.append(f"Time {time + 1} : {selected.name} finished")
+        admit(time)
+
+        if entry is None:
+            if not heap:
+                end = min(arrivals[next_bucket][0], runfor)
+                log_append((time, IDLE, None, end))
                 last_selected = None
-            else:
-                last_selected = selected
+                time = end
+                continue
+            entry = heappop(heap)
         else:
-            log.append(f"Time {time} : Idle")
+            entry = heappushpop(heap, entry)
+
+        selected = entry[4]
+        if last_selected is None or last_selected.name != selected.name:
+            if selected.start_time is None:
+                selected.start_time = time
+            log_append((time, SELECTED, selected.name, selected.remaining))
+
+        delta = min(selected.remaining, arrivals[next_bucket][0] - time, runfor - time)
+        selected.remaining -= delta
+        selected.run_time += delta
+        time += delta
+        if selected.remaining == 0:
+            selected.finish_time = time
+            log_append((time, FINISHED, selected.name, 0))
             last_selected = None
+            entry = None
+        else:
+            last_selected = selected
+            entry = (selected.remaining,) + entry[1:]
 
-        time += 1
-
-    return log
+    return events
 
 def simulate_rr(process_list, runfor, quantum):
-    log = []
+    events = []
+    log_append = events.append
     time = 0
-    ready_queue = deque()
     running = None
     remaining_quantum = 0
 
+    # ring[head], ring[head+1], ... (mod n) are the size ready processes.
+    # running is re-queued only once its slice ends, so no process takes
+    # two slots and n is enough
+    n = len(process_list)
+    ring = [None] * n
+    head = size = 0
+
+    arrivals = arrivals_by_time(process_list)
+    next_bucket = 0
+    # arrivals before time 0 are never seen by the scheduler
+    while arrivals[next_bucket][0] < 0:
+        next_bucket += 1
+
+    # advance in segments that end at the next arrival, the end of the
+    # quantum or the end of the burst, whichever comes first
     while time < runfor:
-        for p in process_list:
-            if p.arrival == time:
-                log.append(f"Time {time} : {p.name} arrived")
-                if not p.is_finished():
-                    ready_queue.append(p)
-
-        if running is None or running.is_finished() or remaining_quantum == 0:
-            if running is not None and (not running.is_finished()) and remaining_quantum == 0:
-                ready_queue.append(running)
+        if arrivals[next_bucket][0] == time:
+            for p in arrivals[next_bucket][1]:
+                log_append((time, ARRIVED, p.name, 0))
+                if p.remaining > 0:
+                    ring[(head + size) % n] = p
+                    size += 1
+            next_bucket += 1
+
+        if running is None or running.remaining <= 0 or remaining_quantum == 0:
+            if running is not None and running.remaining > 0 and remaining_quantum == 0:
+                ring[(head + size) % n] = running
+                size += 1
             running = None
             remaining_quantum = 0
-            while ready_queue:
-                candidate = ready_queue.popleft()
-                if not candidate.is_finished():
+            while size:
+                candidate = ring[head]
+                head = (head + 1) % n
+                size -= 1
+                if candidate.remaining > 0:
                     running = candidate
                     remaining_quantum = quantum
                     if candidate.start_time is None:
                         candidate.start_time = time
-                    log.append(f"Time {time} : {candidate.name} selected (burst {candidate.remaining})")
+                    log_append((time, SELECTED, candidate.name, candidate.remaining))
                     break
 
         if running is None:
-            log.append(f"Time {time} : Idle")
-        else:
-            running.remaining -= 1
-            running.run_time += 1
-            remaining_quantum -= 1
-            if running.remaining == 0:
-                running.finish_time = time + 1
-                log.append(f"Time {time + 1} : {running.name} finished")
-                running = None
-                remaining_quantum = 0
+            end = min(arrivals[next_bucket][0], runfor)
+            log_append((time, IDLE, None, end))
+            time = end
+            continue
 
-        time += 1
+        delta = min(running.remaining, arrivals[next_bucket][0] - time, runfor - time)
+        if remaining_quantum > 0:
+            delta = min(delta, remaining_quantum)
+        running.remaining -= delta
+        running.run_time += delta
+        remaining_quantum -= delta
+        time += delta
+        if running.remaining == 0:
+            running.finish_time = time
+            log_append((time, FINISHED, running.name, 0))
+            running = None
+            remaining_quantum = 0
 
-    return log
+    return events
 
 # -------------------------
 # Metrics
 # -------------------------
 def print_metrics_lines(process_list):
+    # one pass in input order; the "did not finish" lines follow all the
+    # metric lines, so they are collected on the side and appended
     lines = []
     unfinished = []
-    for p in process_list:
-        if p.is_finished() and (p.finish_time is not None):
-            turnaround = p.finish_time - p.arrival
-            waiting = turnaround - p.burst
+    for p in sorted(process_list, key=lambda p: p.index):
+        finish = p.finish_time
+        if finish is not None:
+            turnaround = finish - p.arrival
             response = p.start_time - p.arrival if p.start_time is not None else 0
-            lines.append(f"{p.name} wait {waiting} turnaround {turnaround} response {response}")
+            lines.append(b"%s wait %d turnaround %d response %d\n"
+                         % (p.name.encode('utf-8'), turnaround - p.burst, turnaround, response))
         else:
-            unfinished.append(p.name)
-    return lines, unfinished
+            unfinished.append(b"%s did not finish\n" % p.name.encode('utf-8'))
+    lines += unfinished
+    return lines
 
 # -------------------------
 # Main
@@ -295,35 +410,28 @@ def main():
     use_algo = params['use']
     quantum = params['quantum']
 
-    sim_procs = [Process(p.name, p.arrival, p.burst) for p in processes]
-
     output_file = "outputTEST.out"
-    with open(output_file, 'w') as out:
-        out.write(f"{params['processcount']} processes\n")
+    with open(output_file, 'wb', buffering=1 << 20) as out:
+        out.write(b"%d processes\n" % params['processcount'])
 
         if use_algo == 'sjf':
-            out.write("Using preemptive Shortest Job First\n")
-            log = simulate_sjf_preemptive(sim_procs, runfor)
+            out.write(b"Using preemptive Shortest Job First\n")
+            events = simulate_sjf_preemptive(processes, runfor)
         elif use_algo == 'fcfs':
-            out.write("Using First Come First Served\n")
-            log = simulate_fcfs(sim_procs, runfor)
+            out.write(b"Using First Come First Served\n")
+            events = simulate_fcfs(processes, runfor)
         elif use_algo == 'rr':
-            out.write("Using Round Robin\n")
-            out.write(f"Quantum {quantum}\n")
-            log = simulate_rr(sim_procs, runfor, quantum)
+            out.write(b"Using Round Robin\n")
+            out.write(b"Quantum %d\n" % quantum)
+            events = simulate_rr(processes, runfor, quantum)
         else:
             error_and_exit("Error: Missing parameter use")
 
-        for line in log:
-            out.write(line + "\n")
+        out.writelines(format_log(events))
 
-        out.write(f"Finished at time {runfor}\n\n")
+        out.write(b"Finished at time %d\n\n" % runfor)
 
-        metric_lines, unfinished = print_metrics_lines(sim_procs)
-        for ml in metric_lines:
-            out.write(ml + "\n")
-        for name in unfinished:
-            out.write(f"{name} did not finish\n")
+        out.writelines(print_metrics_lines(processes))
 
     print(f"? Simulation complete. Results written to {output_file}")
 